@@ -5,19 +5,47 @@ Main server for 3D file analysis and price calculation
 """
 
 import os
-import tempfile
 import json
 import math
-from typing import Optional, Dict, Any, List
-from fastapi import FastAPI, File, UploadFile, HTTPException, Form
+import hashlib
+import gzip
+import functools
+import uuid
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List, Tuple, Iterator
+from typing_extensions import Annotated
+import numpy as np
+import orjson
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, Response, JSONResponse, StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.datastructures import FormData, Headers, UploadFile
+from starlette.types import Receive, Scope, Send
+
+try:
+    from numba import njit
+except ImportError:
+    # Numba is optional: without it the pricing core runs as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
+
+class ORJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson instead of the stdlib json module
+    (FastAPI's own ORJSONResponse is deprecated in recent releases)
+    """
+    
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_SERIALIZE_NUMPY)
 
 app = FastAPI(
     title="CODAGE11 3D Pricer API",
     description="API for 3D printing price calculation and file analysis",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -29,6 +57,24 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+class NegotiatedGZipMiddleware(GZipMiddleware):
+    """
+    GZipMiddleware that negotiates with _accepts_gzip, like _static_response:
+    Starlette only looks for "gzip" in Accept-Encoding, so a gzip;q=0 client
+    would get compressed bytes. Already-encoded responses pass through as-is
+    """
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http" and not _accepts_gzip(
+            Headers(scope=scope).get("accept-encoding", "")
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+# Compress dynamic JSON responses; static payloads are pre-gzipped below
+app.add_middleware(NegotiatedGZipMiddleware, minimum_size=500)
+
 # Mount static files
 app.mount("/css", StaticFiles(directory="css"), name="css")
 app.mount("/js", StaticFiles(directory="js"), name="js")
@@ -65,6 +111,30 @@ MATERIALS = {
     }
 }
 
+# Static payloads (the materials list, HTML pages) never change at runtime:
+# encode and gzip them once, and let clients revalidate with the ETag
+def _precompute_variants(content: bytes, cache_control: str) -> Dict[str, Tuple[bytes, Dict[str, str]]]:
+    """Identity and gzip encodings of a static payload, each with its own ETag"""
+    digest = hashlib.sha1(content).hexdigest()
+    headers = {"Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    return {
+        "identity": (content, {**headers, "ETag": f'"{digest}"'}),
+        "gzip": (
+            gzip.compress(content, mtime=0),
+            {**headers, "ETag": f'"{digest}-gzip"', "Content-Encoding": "gzip"}
+        )
+    }
+
+def _load_page(path: str) -> Dict[str, Tuple[bytes, Dict[str, str]]]:
+    with open(path, "rb") as f:
+        return _precompute_variants(f.read(), "no-cache")
+
+_MATERIALS_VARIANTS = _precompute_variants(orjson.dumps(MATERIALS), "public, max-age=3600")
+_PAGES = {
+    page: _load_page(page)
+    for page in ("index.html", "upload.html", "viewer.html", "pricing.html")
+}
+
 # Pricing configuration
 PRICING_CONFIG = {
     "base_print_time_per_cm3": 2.0,  # minutes per cm³
@@ -75,75 +145,113 @@ PRICING_CONFIG = {
     "minimum_price": 5.0  # Minimum order value
 }
 
-def analyze_3d_file_simple(file_path: str, file_size: int) -> Dict[str, Any]:
+# Flattened views of MATERIALS / PRICING_CONFIG for the pricing hot path:
+# one tuple unpack instead of repeated nested dict lookups per quote
+_MAT_TABLE: Dict[str, Tuple[float, float, float, float]] = {
+    key: (
+        props["density"],
+        props["price_per_kg"],
+        props["print_speed_modifier"],
+        props["support_difficulty"]
+    )
+    for key, props in MATERIALS.items()
+}
+_BASE_PRINT_TIME_PER_CM3 = PRICING_CONFIG["base_print_time_per_cm3"]
+_MACHINE_COST_PER_HOUR = PRICING_CONFIG["machine_cost_per_hour"]
+_POST_PROCESSING_BASE = PRICING_CONFIG["post_processing_base"]
+_SUPPORT_COST_MULTIPLIER = PRICING_CONFIG["support_cost_multiplier"]
+_MARGIN = PRICING_CONFIG["margin"]
+_MINIMUM_PRICE = PRICING_CONFIG["minimum_price"]
+
+# Column-wise material properties for batch pricing, indexed via _MAT_INDEX:
+# one contiguous gather per property instead of per-item dict lookups
+_MAT_NAMES = tuple(MATERIALS)
+_MAT_INDEX = {name: i for i, name in enumerate(_MAT_NAMES)}
+_DENSITY = np.array([MATERIALS[name]["density"] for name in _MAT_NAMES])
+_PRICE_KG = np.array([MATERIALS[name]["price_per_kg"] for name in _MAT_NAMES])
+_SPEED = np.array([MATERIALS[name]["print_speed_modifier"] for name in _MAT_NAMES])
+
+# Simulated model proportions (x, y, z relative to a cube): slightly rectangular
+_SIDE_SCALE = (1.2, 0.8, 1.0)
+
+# math.cbrt is faster and more accurate than ** (1/3) but needs Python 3.11
+_cbrt = getattr(math, "cbrt", lambda x: x ** (1/3))
+
+# Accepted 3D file formats
+_ALLOWED_EXT = frozenset({'.stl', '.obj', '.ply', '.step', '.stp'})
+_UNSUPPORTED_TYPE_DETAIL = f"Unsupported file type. Allowed: {', '.join(sorted(_ALLOWED_EXT))}"
+
+# Pricing input errors shared by the single-file and batch paths
+_LAYER_HEIGHT_DETAIL = "Layer height must be greater than 0"
+_OUT_OF_RANGE_DETAIL = "Print parameters out of range"
+
+# Upload limits
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50 MB, matches the frontend check
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # Read uploads 1 MB at a time
+MULTIPART_OVERHEAD = 64 * 1024  # Allowance for form fields and part headers
+_FILE_TOO_LARGE_DETAIL = f"File too large. Maximum size: {MAX_UPLOAD_SIZE // (1024 * 1024)} MB"
+MAX_BATCH_SIZE = 1000  # Items per /api/analyze_batch request
+
+def analyze_3d_file_simple(filename: str, file_size: int) -> Dict[str, Any]:
     """
     Simple 3D file analysis without trimesh (for demo purposes)
     In production, this would use proper 3D analysis libraries
+    (streaming from the upload's SpooledTemporaryFile, which only
+    spills to disk for large files)
     """
-    try:
-        # Get file extension
-        file_ext = os.path.splitext(file_path)[1].lower()
-        
-        # Simulate analysis based on file size and type
-        # This is a simplified version for demonstration
-        
-        # Estimate volume based on file size (very rough approximation)
-        # Larger files typically mean more complex/larger models
-        estimated_volume_cm3 = max(1.0, file_size / 100000 * 10)  # Rough heuristic
-        
-        # Simulate other properties
-        estimated_surface_area = estimated_volume_cm3 * 6  # Rough cube approximation
-        
-        # Simulate dimensions (assuming roughly cubic shape)
-        cube_side = estimated_volume_cm3 ** (1/3)
-        dimensions_cm = {
-            "x": round(cube_side * 1.2, 2),  # Slightly rectangular
-            "y": round(cube_side * 0.8, 2),
-            "z": round(cube_side * 1.0, 2)
-        }
-        
-        # Simulate complexity based on file size
-        complexity_factor = min(1.0, file_size / 1000000)  # Normalize to file size
-        
-        # Simulate face count
-        face_count = int(file_size / 50)  # Rough estimate
-        vertex_count = int(face_count * 0.6)
-        
-        # Basic printability checks
-        is_watertight = True  # Assume good for demo
-        needs_supports = complexity_factor > 0.3  # Heuristic
-        
-        return {
-            "volume_cm3": round(estimated_volume_cm3, 3),
-            "surface_area_cm2": round(estimated_surface_area, 2),
-            "dimensions_cm": dimensions_cm,
-            "face_count": face_count,
-            "vertex_count": vertex_count,
-            "complexity_factor": round(complexity_factor, 3),
-            "is_watertight": is_watertight,
-            "needs_supports": needs_supports,
-            "analysis_method": "simplified_demo"
-        }
-        
-    except Exception as e:
-        raise ValueError(f"Error analyzing 3D file: {str(e)}")
-
-def calculate_price(analysis: Dict[str, Any], material: str, 
-                   infill: float = 20.0, layer_height: float = 0.2,
-                   include_supports: bool = None) -> Dict[str, Any]:
-    """
-    Calculate printing price based on analysis and parameters
-    """
-    if material not in MATERIALS:
-        raise ValueError(f"Unknown material: {material}")
+    # Get file extension
+    file_ext = os.path.splitext(filename)[1].lower()
     
-    mat_props = MATERIALS[material]
-    volume_cm3 = analysis["volume_cm3"]
+    # Simulate analysis based on file size and type
+    # This is a simplified version for demonstration
     
-    # Auto-detect supports if not specified
-    if include_supports is None:
-        include_supports = analysis["needs_supports"]
+    # Estimate volume based on file size (very rough approximation)
+    # Larger files typically mean more complex/larger models
+    estimated_volume_cm3 = max(1.0, file_size / 100000 * 10)  # Rough heuristic
+    
+    # Simulate other properties
+    estimated_surface_area = estimated_volume_cm3 * 6  # Rough cube approximation
+    
+    # Simulate dimensions (assuming roughly cubic shape)
+    cube_side = _cbrt(estimated_volume_cm3)
+    dimensions_cm = {
+        axis: round(cube_side * scale, 2)
+        for axis, scale in zip("xyz", _SIDE_SCALE)
+    }
     
+    # Simulate complexity based on file size
+    complexity_factor = min(1.0, file_size / 1000000)  # Normalize to file size
+    
+    # Simulate face count
+    face_count = file_size // 50  # Rough estimate
+    vertex_count = int(face_count * 0.6)
+    
+    # Basic printability checks
+    is_watertight = True  # Assume good for demo
+    needs_supports = complexity_factor > 0.3  # Heuristic
+    
+    return {
+        "volume_cm3": round(estimated_volume_cm3, 3),
+        "surface_area_cm2": round(estimated_surface_area, 2),
+        "dimensions_cm": dimensions_cm,
+        "face_count": face_count,
+        "vertex_count": vertex_count,
+        "complexity_factor": round(complexity_factor, 3),
+        "is_watertight": is_watertight,
+        "needs_supports": needs_supports,
+        "analysis_method": "simplified_demo"
+    }
+
+@njit(cache=True)
+def _price_core(volume_cm3: float, complexity_factor: float, density: float,
+                price_per_kg: float, speed_modifier: float, infill: float,
+                layer_height: float, include_supports: bool) -> Tuple[float, ...]:
+    """
+    Unrounded pricing arithmetic on plain floats, compiled to native code
+    when Numba is installed. Returns (weight_g, material_cost,
+    total_time_hours, total_time_minutes, machine_cost, post_processing,
+    subtotal, margin_amount, total_price).
+    """
     # Calculate material usage
     infill_multiplier = 0.1 + (infill / 100) * 0.9  # 10% minimum + infill%
     effective_volume = volume_cm3 * infill_multiplier
@@ -154,146 +262,529 @@ def calculate_price(analysis: Dict[str, Any], material: str,
         effective_volume += support_volume
     
     # Calculate material weight and cost
-    weight_g = effective_volume * mat_props["density"]
+    weight_g = effective_volume * density
     weight_kg = weight_g / 1000
-    material_cost = weight_kg * mat_props["price_per_kg"]
+    material_cost = weight_kg * price_per_kg
     
     # Calculate print time
-    base_time_minutes = volume_cm3 * PRICING_CONFIG["base_print_time_per_cm3"]
+    base_time_minutes = volume_cm3 * _BASE_PRINT_TIME_PER_CM3
     
     # Apply modifiers
     layer_modifier = 0.2 / layer_height  # Thinner layers = longer time
-    speed_modifier = mat_props["print_speed_modifier"]
-    complexity_modifier = 1 + (analysis["complexity_factor"] * 0.5)
-    support_modifier = 1 + (0.3 if include_supports else 0)
+    complexity_modifier = 1 + (complexity_factor * 0.5)
+    support_modifier = 1.3 if include_supports else 1.0
     
     total_time_minutes = (base_time_minutes * layer_modifier * 
                          complexity_modifier * support_modifier / speed_modifier)
     total_time_hours = total_time_minutes / 60
     
     # Calculate machine time cost
-    machine_cost = total_time_hours * PRICING_CONFIG["machine_cost_per_hour"]
+    machine_cost = total_time_hours * _MACHINE_COST_PER_HOUR
     
     # Post-processing cost
-    post_processing = PRICING_CONFIG["post_processing_base"]
+    post_processing = _POST_PROCESSING_BASE
     if include_supports:
-        post_processing += material_cost * PRICING_CONFIG["support_cost_multiplier"]
+        post_processing += material_cost * _SUPPORT_COST_MULTIPLIER
     
     # Total before margin
     subtotal = material_cost + machine_cost + post_processing
     
     # Apply margin
-    margin_amount = subtotal * PRICING_CONFIG["margin"]
+    margin_amount = subtotal * _MARGIN
     total_price = subtotal + margin_amount
     
     # Apply minimum price
-    total_price = max(total_price, PRICING_CONFIG["minimum_price"])
+    total_price = max(total_price, _MINIMUM_PRICE)
     
-    return {
-        "material": {
-            "type": material,
-            "name": mat_props["name"],
-            "weight_g": round(weight_g, 2),
-            "cost": round(material_cost, 2)
-        },
-        "print_time": {
-            "hours": round(total_time_hours, 2),
-            "minutes": round(total_time_minutes, 0)
-        },
-        "costs": {
-            "material": round(material_cost, 2),
-            "machine_time": round(machine_cost, 2),
-            "post_processing": round(post_processing, 2),
-            "subtotal": round(subtotal, 2),
-            "margin": round(margin_amount, 2),
-            "total": round(total_price, 2)
-        },
-        "parameters": {
-            "infill_percent": infill,
-            "layer_height_mm": layer_height,
-            "includes_supports": include_supports
-        }
-    }
+    return (weight_g, material_cost, total_time_hours, total_time_minutes,
+            machine_cost, post_processing, subtotal, margin_amount, total_price)
+
+# Compile (or load from the Numba cache) at import rather than on the first
+# quote, which would otherwise stall the event loop in each worker
+_price_core(1.0, 0.0, 1.0, 1.0, 1.0, 20.0, 0.2, False)
+
+@functools.lru_cache(maxsize=4096)
+def _calculate_price_core(volume_cm3: float, complexity_factor: float,
+                          material: str, infill: float, layer_height: float,
+                          include_supports: bool) -> Tuple[float, ...]:
+    """
+    Rounded pricing figures, cached on their scalar inputs so repeated quotes
+    (e.g. UI sliders going back and forth) are a single dict lookup.
+    Same order as _price_core.
+    """
+    density, price_per_kg, speed_modifier, _ = _MAT_TABLE[material]
+    
+    (weight_g, material_cost, total_time_hours, total_time_minutes,
+     machine_cost, post_processing, subtotal, margin_amount,
+     total_price) = _price_core(
+        float(volume_cm3), float(complexity_factor), density, price_per_kg,
+        speed_modifier, float(infill), float(layer_height), include_supports
+    )
+    
+    if not math.isfinite(total_price):
+        raise ValueError(_OUT_OF_RANGE_DETAIL)
+    
+    return (
+        round(weight_g, 2),
+        round(material_cost, 2),
+        round(total_time_hours, 2),
+        round(total_time_minutes, 0),
+        round(machine_cost, 2),
+        round(post_processing, 2),
+        round(subtotal, 2),
+        round(margin_amount, 2),
+        round(total_price, 2)
+    )
+
+# Pricing result types: orjson serializes dataclasses natively, so these
+# double as the JSON schema of the "pricing" object
+@dataclass
+class MaterialUsage:
+    type: str
+    name: str
+    weight_g: float
+    cost: float
+
+@dataclass
+class PrintTime:
+    hours: float
+    minutes: float
+
+@dataclass
+class Costs:
+    material: float
+    machine_time: float
+    post_processing: float
+    subtotal: float
+    margin: float
+    total: float
+
+@dataclass
+class PriceParameters:
+    infill_percent: float
+    layer_height_mm: float
+    includes_supports: bool
+
+@dataclass
+class PriceResult:
+    material: MaterialUsage
+    print_time: PrintTime
+    costs: Costs
+    parameters: PriceParameters
+
+def calculate_price(analysis: Dict[str, Any], material: str, 
+                   infill: float = 20.0, layer_height: float = 0.2,
+                   include_supports: bool = None) -> PriceResult:
+    """
+    Calculate printing price based on analysis and parameters
+    """
+    if material not in MATERIALS:
+        raise ValueError(f"Unknown material: {material}")
+    if not layer_height > 0:
+        raise ValueError(_LAYER_HEIGHT_DETAIL)
+    
+    # Auto-detect supports if not specified
+    if include_supports is None:
+        include_supports = analysis["needs_supports"]
+    
+    (weight_g, material_cost, total_time_hours, total_time_minutes,
+     machine_cost, post_processing, subtotal, margin_amount,
+     total_price) = _calculate_price_core(
+        analysis["volume_cm3"], analysis["complexity_factor"],
+        material, infill, layer_height, bool(include_supports)
+    )
+    
+    return PriceResult(
+        material=MaterialUsage(
+            type=material,
+            name=MATERIALS[material]["name"],
+            weight_g=weight_g,
+            cost=material_cost
+        ),
+        print_time=PrintTime(hours=total_time_hours, minutes=total_time_minutes),
+        costs=Costs(
+            material=material_cost,
+            machine_time=machine_cost,
+            post_processing=post_processing,
+            subtotal=subtotal,
+            margin=margin_amount,
+            total=total_price
+        ),
+        parameters=PriceParameters(
+            infill_percent=infill,
+            layer_height_mm=layer_height,
+            includes_supports=include_supports
+        )
+    )
+
+class BatchItem(BaseModel):
+    """A single file to quote in /api/analyze_batch"""
+    filename: str
+    file_size: int = Field(ge=0, le=MAX_UPLOAD_SIZE)
+    material: str = "PLA"
+    infill: float = 20.0
+    layer_height: float = 0.2
+    include_supports: Optional[bool] = None
+
+def _round_all(values: np.ndarray, ndigits: int) -> List[float]:
+    """
+    Round like the scalar path's round(), vectorized. np.round scales by
+    10**ndigits first, which only picks the wrong side when the scaled value
+    sits within float error of a .5 tie, so just those fall back to round()
+    """
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    rounded = (np.round(scaled) / scale).tolist()
+    distance_to_tie = np.abs(np.abs(scaled - np.trunc(scaled)) - 0.5)
+    for i in np.flatnonzero(distance_to_tie <= 1e-9 * np.maximum(1.0, np.abs(scaled))).tolist():
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+def analyze_and_price_batch(items: List[BatchItem]) -> Iterator[Dict[str, Any]]:
+    """
+    Vectorized equivalent of analyze_3d_file_simple + calculate_price
+    for many files at once, computed with NumPy array operations.
+    Inputs are validated eagerly; per-file results are built lazily
+    """
+    if not items:
+        return iter(())
+    
+    for i, item in enumerate(items):
+        if os.path.splitext(item.filename)[1].lower() not in _ALLOWED_EXT:
+            raise ValueError(f"Item {i}: {_UNSUPPORTED_TYPE_DETAIL}")
+        if item.material not in _MAT_INDEX:
+            raise ValueError(f"Item {i}: Unknown material: {item.material}")
+        if not item.layer_height > 0:
+            raise ValueError(f"Item {i}: {_LAYER_HEIGHT_DETAIL}")
+    
+    file_sizes = np.array([item.file_size for item in items], dtype=np.float64)
+    mat_idx = np.array([_MAT_INDEX[item.material] for item in items], dtype=np.intp)
+    infill = np.array([item.infill for item in items], dtype=np.float64)
+    layer_height = np.array([item.layer_height for item in items], dtype=np.float64)
+    
+    # Simplified analysis (see analyze_3d_file_simple)
+    raw_volume = np.maximum(1.0, file_sizes / 100000 * 10)
+    cube_side = np.cbrt(raw_volume)
+    raw_complexity = np.minimum(1.0, file_sizes / 1000000)
+    needs_supports = raw_complexity > 0.3
+    face_count = file_sizes.astype(np.int64) // 50
+    vertex_count = (face_count * 0.6).astype(np.int64)
+    volume_cm3 = np.array(_round_all(raw_volume, 3))
+    complexity_factor = np.array(_round_all(raw_complexity, 3))
+    
+    include_supports = np.array([
+        needs if item.include_supports is None else item.include_supports
+        for item, needs in zip(items, needs_supports.tolist())
+    ], dtype=bool)
+    
+    # Pricing (see _calculate_price_core)
+    density, price_per_kg, speed_modifier = _DENSITY[mat_idx], _PRICE_KG[mat_idx], _SPEED[mat_idx]
+    
+    infill_multiplier = 0.1 + (infill / 100) * 0.9
+    effective_volume = volume_cm3 * infill_multiplier
+    effective_volume += np.where(include_supports, volume_cm3 * 0.15, 0.0)
+    
+    weight_g = effective_volume * density
+    material_cost = weight_g / 1000 * price_per_kg
+    
+    base_time_minutes = volume_cm3 * _BASE_PRINT_TIME_PER_CM3
+    layer_modifier = 0.2 / layer_height
+    complexity_modifier = 1 + (complexity_factor * 0.5)
+    support_modifier = np.where(include_supports, 1.3, 1.0)
+    total_time_minutes = (base_time_minutes * layer_modifier *
+                          complexity_modifier * support_modifier / speed_modifier)
+    total_time_hours = total_time_minutes / 60
+    machine_cost = total_time_hours * _MACHINE_COST_PER_HOUR
+    
+    post_processing = _POST_PROCESSING_BASE + np.where(
+        include_supports, material_cost * _SUPPORT_COST_MULTIPLIER, 0.0
+    )
+    subtotal = material_cost + machine_cost + post_processing
+    margin_amount = subtotal * _MARGIN
+    total_price = np.maximum(subtotal + margin_amount, _MINIMUM_PRICE)
+    
+    out_of_range = np.flatnonzero(~np.isfinite(total_price))
+    if out_of_range.size:
+        raise ValueError(f"Item {out_of_range[0]}: {_OUT_OF_RANGE_DETAIL}")
+    
+    # Round every 2-decimal column in one pass, then hand plain floats back
+    columns = np.stack([
+        cube_side * _SIDE_SCALE[0], cube_side * _SIDE_SCALE[1],
+        cube_side * _SIDE_SCALE[2], raw_volume * 6,
+        weight_g, material_cost, total_time_hours, machine_cost,
+        post_processing, subtotal, margin_amount, total_price
+    ])
+    rounded = _round_all(columns.ravel(), 2)
+    (dim_x, dim_y, dim_z, surface_area, weight_g, material_cost, total_time_hours,
+     machine_cost, post_processing, subtotal, margin_amount, total_price) = (
+        rounded[i:i + len(items)] for i in range(0, len(rounded), len(items))
+    )
+    total_time_minutes = _round_all(total_time_minutes, 0)
+    volume_cm3, complexity_factor = volume_cm3.tolist(), complexity_factor.tolist()
+    face_count, vertex_count = face_count.tolist(), vertex_count.tolist()
+    infill, layer_height = infill.tolist(), layer_height.tolist()
+    needs_supports, include_supports = needs_supports.tolist(), include_supports.tolist()
+    
+    def results() -> Iterator[Dict[str, Any]]:
+        for i, item in enumerate(items):
+            yield {
+                "filename": item.filename,
+                "file_size_bytes": item.file_size,
+                "analysis": {
+                    "volume_cm3": volume_cm3[i],
+                    "surface_area_cm2": surface_area[i],
+                    "dimensions_cm": {"x": dim_x[i], "y": dim_y[i], "z": dim_z[i]},
+                    "face_count": face_count[i],
+                    "vertex_count": vertex_count[i],
+                    "complexity_factor": complexity_factor[i],
+                    "is_watertight": True,
+                    "needs_supports": needs_supports[i],
+                    "analysis_method": "simplified_demo"
+                },
+                "pricing": PriceResult(
+                    material=MaterialUsage(
+                        type=item.material,
+                        name=MATERIALS[item.material]["name"],
+                        weight_g=weight_g[i],
+                        cost=material_cost[i]
+                    ),
+                    print_time=PrintTime(
+                        hours=total_time_hours[i],
+                        minutes=total_time_minutes[i]
+                    ),
+                    costs=Costs(
+                        material=material_cost[i],
+                        machine_time=machine_cost[i],
+                        post_processing=post_processing[i],
+                        subtotal=subtotal[i],
+                        margin=margin_amount[i],
+                        total=total_price[i]
+                    ),
+                    parameters=PriceParameters(
+                        infill_percent=infill[i],
+                        layer_height_mm=layer_height[i],
+                        includes_supports=include_supports[i]
+                    )
+                ),
+                "status": "success"
+            }
+    
+    return results()
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Whether an Accept-Encoding header allows gzip, honouring q-values:
+    an explicit gzip entry wins over "*", and q=0 means not acceptable
+    """
+    qualities = {}
+    for entry in accept_encoding.split(","):
+        coding, _, params = entry.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    quality = qualities.get("gzip", qualities.get("x-gzip", qualities.get("*", 0.0)))
+    return quality > 0
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """
+    Whether an If-None-Match header lists the ETag: comma-separated tags,
+    compared weakly (a W/ prefix is ignored), with "*" matching anything
+    """
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == "*" or tag == etag:
+            return True
+    return False
+
+def _static_response(request: Request, variants: Dict[str, Tuple[bytes, Dict[str, str]]],
+                     media_type: str) -> Response:
+    """
+    Serve a precomputed payload, gzipped if the client accepts it,
+    or an empty 304 if the client's copy is current
+    """
+    encoding = "gzip" if _accepts_gzip(request.headers.get("accept-encoding", "")) else "identity"
+    content, headers = variants[encoding]
+    if _etag_matches(request.headers.get("if-none-match", ""), headers["ETag"]):
+        return Response(status_code=304, headers={
+            key: value for key, value in headers.items() if key != "Content-Encoding"
+        })
+    return Response(content=content, media_type=media_type, headers=headers)
 
 @app.get("/", response_class=HTMLResponse)
-async def read_root():
+async def read_root(request: Request):
     """Serve the main index page"""
-    return FileResponse("index.html")
+    return _static_response(request, _PAGES["index.html"], "text/html")
 
 @app.get("/upload", response_class=HTMLResponse)
-async def upload_page():
+async def upload_page(request: Request):
     """Serve the upload page"""
-    return FileResponse("upload.html")
+    return _static_response(request, _PAGES["upload.html"], "text/html")
 
 @app.get("/viewer", response_class=HTMLResponse)
-async def viewer_page():
+async def viewer_page(request: Request):
     """Serve the 3D viewer page"""
-    return FileResponse("viewer.html")
+    return _static_response(request, _PAGES["viewer.html"], "text/html")
 
 @app.get("/pricing", response_class=HTMLResponse)
-async def pricing_page():
+async def pricing_page(request: Request):
     """Serve the pricing page"""
-    return FileResponse("pricing.html")
+    return _static_response(request, _PAGES["pricing.html"], "text/html")
 
 @app.get("/api/materials")
-async def get_materials():
+async def get_materials(request: Request):
     """Get available materials and their properties"""
-    return MATERIALS
-
-@app.post("/api/analyze")
-async def analyze_file(
-    file: UploadFile = File(...),
-    material: str = Form("PLA"),
-    infill: float = Form(20.0),
-    layer_height: float = Form(0.2),
-    include_supports: Optional[bool] = Form(None)
-):
+    return _static_response(request, _MATERIALS_VARIANTS, "application/json")
+
+# Documents the multipart body that analyze_file parses by hand
+_ANALYZE_FORM_SCHEMA = {
+    "requestBody": {
+        "required": True,
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "required": ["file"],
+                    "properties": {
+                        "file": {"type": "string", "format": "binary"},
+                        "material": {"type": "string", "default": "PLA"},
+                        "infill": {"type": "number", "default": 20.0},
+                        "layer_height": {"type": "number", "default": 0.2},
+                        "include_supports": {"type": "boolean"}
+                    }
+                }
+            }
+        }
+    }
+}
+
+_FORM_TRUE = frozenset({"1", "true", "t", "yes", "y", "on"})
+_FORM_FALSE = frozenset({"0", "false", "f", "no", "n", "off"})
+
+def _form_str(form: FormData, field: str) -> Optional[str]:
+    """Read a text form field; file parts in its place are rejected"""
+    value = form.get(field)
+    if value is not None and not isinstance(value, str):
+        raise HTTPException(status_code=400, detail=f"Invalid {field}: expected a text value")
+    return value
+
+def _form_float(form: FormData, field: str, default: float) -> float:
+    """Read a float form field; missing or empty values use the default"""
+    value = _form_str(form, field)
+    if not value:
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid {field}: {value}")
+
+def _form_bool(form: FormData, field: str) -> Optional[bool]:
+    """Read an optional boolean form field, accepting the usual spellings"""
+    value = _form_str(form, field)
+    if not value:
+        return None
+    value = value.lower()
+    if value in _FORM_TRUE:
+        return True
+    if value in _FORM_FALSE:
+        return False
+    raise HTTPException(status_code=400, detail=f"Invalid {field}: {value}")
+
+@app.post("/api/analyze", openapi_extra=_ANALYZE_FORM_SCHEMA)
+async def analyze_file(request: Request):
     """
     Analyze a 3D file and calculate pricing
     """
-    # Validate file type
-    allowed_extensions = {'.stl', '.obj', '.ply', '.step', '.stp'}
-    file_extension = os.path.splitext(file.filename.lower())[1]
-    
-    if file_extension not in allowed_extensions:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"Unsupported file type. Allowed: {', '.join(allowed_extensions)}"
+    # Parsing the form receives the whole body and spills it to disk, so
+    # refuse declared oversize uploads before reading any of it
+    content_length = request.headers.get("content-length", "")
+    if content_length.isdigit() and int(content_length) > MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD:
+        raise HTTPException(status_code=413, detail=_FILE_TOO_LARGE_DETAIL)
+    
+    # The form is parsed directly rather than through Form()/File()
+    # parameters, skipping per-field dependency resolution and validation
+    async with request.form() as form:
+        file = form.get("file")
+        if not isinstance(file, UploadFile):
+            raise HTTPException(status_code=400, detail="No file uploaded")
+        material = _form_str(form, "material") or "PLA"
+        infill = _form_float(form, "infill", 20.0)
+        layer_height = _form_float(form, "layer_height", 0.2)
+        include_supports = _form_bool(form, "include_supports")
+        
+        return await _analyze_upload(
+            file, material, infill, layer_height, include_supports
         )
+
+async def _analyze_upload(file: UploadFile, material: str, infill: float,
+                          layer_height: float,
+                          include_supports: Optional[bool]) -> Response:
+    """Validate, measure and price an uploaded file"""
+    # Validate file type before touching the upload body
+    file_extension = os.path.splitext(file.filename)[1].lower()
+    
+    if file_extension not in _ALLOWED_EXT:
+        raise HTTPException(status_code=400, detail=_UNSUPPORTED_TYPE_DETAIL)
     
-    # Create temporary file
-    with tempfile.NamedTemporaryFile(delete=False, suffix=file_extension) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
-        tmp_file_path = tmp_file.name
+    # Measure the upload without keeping it in memory; this also catches
+    # oversize files sent without (or with an understated) Content-Length
+    file_size = 0
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        file_size += len(chunk)
+        if file_size > MAX_UPLOAD_SIZE:
+            raise HTTPException(status_code=413, detail=_FILE_TOO_LARGE_DETAIL)
     
     try:
         # Analyze the 3D file (simplified version)
-        analysis = analyze_3d_file_simple(tmp_file_path, len(content))
+        analysis = analyze_3d_file_simple(file.filename, file_size)
         
         # Calculate pricing
         pricing = calculate_price(
             analysis, material, infill, layer_height, include_supports
         )
         
-        return {
+        # Returned as a response so orjson encodes the PriceResult directly,
+        # skipping FastAPI's jsonable_encoder pass over the whole payload
+        return ORJSONResponse({
             "filename": file.filename,
-            "file_size_bytes": len(content),
+            "file_size_bytes": file_size,
             "analysis": analysis,
             "pricing": pricing,
             "status": "success"
-        }
+        })
         
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal error: {str(e)}")
-    finally:
-        # Cleanup temporary file
-        try:
-            os.unlink(tmp_file_path)
-        except:
-            pass
+
+@app.post("/api/analyze_batch")
+async def analyze_batch(
+    # Declared on the type so oversize batches are rejected (422) before
+    # any item is validated
+    items: Annotated[List[BatchItem], Field(max_length=MAX_BATCH_SIZE)]
+):
+    """
+    Analyze and price many files in one request, streamed as NDJSON
+    """
+    try:
+        results = analyze_and_price_batch(items)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    # One JSON object per line, so clients can render results as they arrive
+    async def stream_results():
+        for result in results:
+            yield orjson.dumps(result) + b"\n"
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
 
 @app.get("/api/quote/{quote_id}")
 async def get_quote(quote_id: str):
@@ -305,7 +796,6 @@ async def get_quote(quote_id: str):
 async def create_quote(quote_data: dict):
     """Create a new quote (placeholder for future database integration)"""
     # This would typically save to a database and return a quote ID
-    import uuid
     quote_id = str(uuid.uuid4())
     return {"quote_id": quote_id, "status": "created"}
 
@@ -316,7 +806,19 @@ if __name__ == "__main__":
     # Try to import uvicorn, if not available use basic HTTP server
     try:
         import uvicorn
-        uvicorn.run(app, host="0.0.0.0", port=8000)
+        # One worker per CPU (override with WEB_CONCURRENCY); multiple workers
+        # need the app as an import string. "auto" picks uvloop and httptools,
+        # installed by uvicorn[standard], and falls back where they're missing
+        # (uvloop doesn't support Windows)
+        workers = int(os.environ.get("WEB_CONCURRENCY", max(2, os.cpu_count() or 1)))
+        uvicorn.run(
+            "main:app",
+            host="0.0.0.0",
+            port=8000,
+            loop="auto",
+            http="auto",
+            workers=workers
+        )
     except ImportError:
         print("⚠️  uvicorn not available, please install it with: pip install uvicorn")
         print("For now, you can test the application structure and files.")